@@ -1,17 +1,21 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import atexit
+import os
+import sys
+import weakref
+from collections.abc import Callable, Coroutine, Iterable, Mapping
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
-import anyio
+import msgspec
 import typer
 
 from ..config import ConfigError, ProjectsConfig
-from ..engines import list_backend_ids
-from ..runtime_loader import resolve_plugins_allowlist
-from ..settings import TakopiSettings, load_settings
-from ..telegram.client import TelegramClient
-from ..telegram.topic_state import TopicStateStore, resolve_state_path
+from ..settings import TakopiSettings, _resolve_config_path, load_settings
 from ..swarm.config import resolve_swarm_ingress_config_from_plugins
 from ..swarm.inbox import append_swarm_envelope, new_swarm_envelope
 from ..swarm.service import (
@@ -25,28 +29,128 @@ from ..swarm.service import (
 from .config import _CONFIG_PATH_OPTION, _config_path_display, _exit_config_error
 
 
+class EnsurePayload(msgspec.Struct, frozen=True):
+    created: bool
+    state_path: str
+    status: dict[str, object]
+
+
+class ControlPayload(msgspec.Struct, frozen=True):
+    chat_id: int
+    message_id: int | None
+    thread_id: int | None
+
+
+class TriggerPayload(msgspec.Struct, frozen=True):
+    chat_id: int
+    event_id: str
+    inbox_path: str
+    thread_id: int | None
+
+
+_ENCODER = msgspec.json.Encoder(order="sorted")
+_RUNNER: asyncio.Runner | None = None
+_PROJECTS_CACHE: dict[tuple[int, Path], tuple[ProjectsConfig, Mapping[str, str]]] = {}
+
+
+@lru_cache(maxsize=8)
+def _cached_load_settings(
+    path: Path,
+    mtime_ns: int,
+    env: tuple[tuple[str, str], ...],
+) -> tuple[TakopiSettings, Path]:
+    # `env` is only part of the key: TakopiSettings reads TAKOPI__* overrides itself.
+    return load_settings(path=path)
+
+
+def _settings_env() -> tuple[tuple[str, str], ...]:
+    return tuple(
+        sorted(
+            (key, value)
+            for key, value in os.environ.items()
+            if key.upper().startswith("TAKOPI__")
+        )
+    )
+
+
+@lru_cache(maxsize=8)
+def _cached_backend_ids(allowlist: frozenset[str] | None) -> tuple[str, ...]:
+    from ..engines import list_backend_ids
+
+    return tuple(list_backend_ids(allowlist=allowlist))
+
+
+def _run_blocking[T](fn: Callable[[], Coroutine[Any, Any, T]]) -> T:
+    # One event loop per process, so repeated commands skip loop setup/teardown.
+    global _RUNNER
+    if _RUNNER is None:
+        _RUNNER = asyncio.Runner()
+        atexit.register(_RUNNER.close)
+    return _RUNNER.run(fn())
+
+
 def _load_settings_for_swarm(
     config_path: Path | None,
 ) -> tuple[TakopiSettings, Path]:
+    cfg_path = _resolve_config_path(config_path)
+    try:
+        mtime_ns = cfg_path.stat().st_mtime_ns
+    except OSError:
+        mtime_ns = None
     try:
-        return load_settings(path=config_path)
+        if mtime_ns is None:
+            return load_settings(path=cfg_path)
+        return _cached_load_settings(cfg_path, mtime_ns, _settings_env())
     except ConfigError as exc:
         _exit_config_error(exc)
     raise AssertionError("unreachable")
 
 
+def _evict_projects(key: tuple[int, Path]) -> None:
+    _PROJECTS_CACHE.pop(key, None)
+
+
+def _resolved_projects(
+    settings: TakopiSettings,
+    *,
+    config_path: Path,
+) -> tuple[ProjectsConfig, Mapping[str, str]]:
+    # Keyed by identity; the entry is dropped when `settings` is collected.
+    key = (id(settings), config_path)
+    cached = _PROJECTS_CACHE.get(key)
+    if cached is not None:
+        return cached
+    from ..runtime_loader import resolve_plugins_allowlist
+
+    allowlist = resolve_plugins_allowlist(settings)
+    engine_ids = _cached_backend_ids(
+        frozenset(allowlist) if allowlist is not None else None
+    )
+    projects = settings.to_projects_config(
+        config_path=config_path, engine_ids=engine_ids
+    )
+    aliases = MappingProxyType(
+        {name: project.alias for name, project in projects.projects.items()}
+    )
+    _PROJECTS_CACHE[key] = (projects, aliases)
+    weakref.finalize(settings, _evict_projects, key)
+    return projects, aliases
+
+
 def _resolve_projects(
     settings: TakopiSettings,
     *,
     config_path: Path,
 ) -> ProjectsConfig:
-    allowlist = resolve_plugins_allowlist(settings)
-    engine_ids = list_backend_ids(allowlist=allowlist)
-    return settings.to_projects_config(config_path=config_path, engine_ids=engine_ids)
+    return _resolved_projects(settings, config_path=config_path)[0]
 
 
-def _project_aliases(projects: ProjectsConfig) -> dict[str, str]:
-    return {key: project.alias for key, project in projects.projects.items()}
+def _project_aliases(
+    settings: TakopiSettings,
+    *,
+    config_path: Path,
+) -> Mapping[str, str]:
+    return _resolved_projects(settings, config_path=config_path)[1]
 
 
 def _status_for_output(status: TopicStatus) -> dict[str, object]:
@@ -69,7 +173,21 @@ def _echo_status_lines(status: TopicStatus) -> None:
 
 
 def _json_dump(payload: object) -> None:
-    typer.echo(json.dumps(payload, sort_keys=True))
+    out = sys.stdout.buffer
+    out.write(_ENCODER.encode(payload))
+    out.write(b"\n")
+    out.flush()
+
+
+def _json_dump_array(items: Iterable[object]) -> None:
+    out = sys.stdout.buffer
+    out.write(b"[")
+    for index, item in enumerate(items):
+        if index:
+            out.write(b",")
+        out.write(_ENCODER.encode(item))
+    out.write(b"]\n")
+    out.flush()
 
 
 def _resolve_target_chat_id(
@@ -85,7 +203,7 @@ def _resolve_target_chat_id(
         project_cfg = projects.projects.get(project_key)
         if project_cfg is not None and project_cfg.chat_id is not None:
             return project_cfg.chat_id
-    return int(settings.transports.telegram.chat_id)
+    return settings.transports.telegram.chat_id
 
 
 def _resolve_project(
@@ -117,309 +235,329 @@ def _resolve_swarm_ingress_or_raise(
     raise AssertionError("unreachable")
 
 
-def create_swarm_app() -> typer.Typer:
-    app = typer.Typer(
-        help=(
-            "Multi-agent swarm orchestration. "
-            "Agents coordinate via topics (Telegram forum threads bound to a project + branch), "
-            "control messages (visible bot messages for coordination — does not start work), "
-            "and triggers (injected prompts that start an agent run)."
-        ),
-    )
-    topics_app = typer.Typer(
-        help=(
-            "Telegram forum threads bound to a project + branch. "
-            "Use 'list' to see tracked topics, 'ensure' to create or reuse one, "
-            "and 'status' to inspect a single thread."
-        ),
-    )
-    control_app = typer.Typer(
-        help=(
-            "Send a visible bot message to a Telegram topic for coordination. "
-            "Control messages are informational and do NOT start an agent run."
-        ),
-    )
-    trigger_app = typer.Typer(
-        help=(
-            "Inject a prompt into Takopi's event loop via the JSONL inbox. "
-            "Unlike control messages, a trigger STARTS an agent run in the target topic."
-        ),
-    )
+app = typer.Typer(
+    help=(
+        "Multi-agent swarm orchestration. "
+        "Agents coordinate via topics (Telegram forum threads bound to a project + branch), "
+        "control messages (visible bot messages for coordination — does not start work), "
+        "and triggers (injected prompts that start an agent run)."
+    ),
+)
+topics_app = typer.Typer(
+    help=(
+        "Telegram forum threads bound to a project + branch. "
+        "Use 'list' to see tracked topics, 'ensure' to create or reuse one, "
+        "and 'status' to inspect a single thread."
+    ),
+)
+control_app = typer.Typer(
+    help=(
+        "Send a visible bot message to a Telegram topic for coordination. "
+        "Control messages are informational and do NOT start an agent run."
+    ),
+)
+trigger_app = typer.Typer(
+    help=(
+        "Inject a prompt into Takopi's event loop via the JSONL inbox. "
+        "Unlike control messages, a trigger STARTS an agent run in the target topic."
+    ),
+)
 
-    @topics_app.command(name="list")
-    def topics_list(
-        chat_id: int | None = typer.Option(
-            None,
-            "--chat-id",
-            help="Filter tracked topics by chat id.",
-        ),
-        as_json: bool = typer.Option(False, "--json", help="Output JSON."),
-        config_path: Path | None = _CONFIG_PATH_OPTION,
-    ) -> None:
-        """List tracked topics from topic state."""
-        settings, resolved_config_path = _load_settings_for_swarm(config_path)
-        try:
-            projects = _resolve_projects(settings, config_path=resolved_config_path)
-        except ConfigError as exc:
-            _exit_config_error(exc)
 
-        store = TopicStateStore(resolve_state_path(resolved_config_path))
-        async def _run() -> list[TopicStatus]:
-            return await list_topic_statuses(
-                store=store,
-                project_aliases=_project_aliases(projects),
-                chat_id=chat_id,
-            )
+@topics_app.command(name="list")
+def topics_list(
+    chat_id: int | None = typer.Option(
+        None,
+        "--chat-id",
+        help="Filter tracked topics by chat id.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Output JSON."),
+    config_path: Path | None = _CONFIG_PATH_OPTION,
+) -> None:
+    """List tracked topics from topic state."""
+    from ..telegram.topic_state import TopicStateStore, resolve_state_path
+
+    settings, resolved_config_path = _load_settings_for_swarm(config_path)
+    try:
+        project_aliases = _project_aliases(settings, config_path=resolved_config_path)
+    except ConfigError as exc:
+        _exit_config_error(exc)
 
-        statuses = anyio.run(_run)
-        if as_json:
-            _json_dump([_status_for_output(status) for status in statuses])
-            return
-        if not statuses:
-            typer.echo("no tracked topics")
-            return
-        for status in statuses:
-            _echo_status_lines(status)
-
-    @topics_app.command(name="status")
-    def topics_status(
-        chat_id: int = typer.Option(..., "--chat-id", help="Chat id."),
-        thread_id: int = typer.Option(..., "--thread-id", help="Thread id."),
-        as_json: bool = typer.Option(False, "--json", help="Output JSON."),
-        config_path: Path | None = _CONFIG_PATH_OPTION,
-    ) -> None:
-        """Show a single topic thread status."""
-        settings, resolved_config_path = _load_settings_for_swarm(config_path)
-        try:
-            projects = _resolve_projects(settings, config_path=resolved_config_path)
-        except ConfigError as exc:
-            _exit_config_error(exc)
-
-        store = TopicStateStore(resolve_state_path(resolved_config_path))
-        snapshot = anyio.run(store.get_thread, chat_id, thread_id)
-        if snapshot is None:
-            typer.echo("topic not found", err=True)
-            raise typer.Exit(code=1)
-        status = snapshot_to_status(snapshot, project_aliases=_project_aliases(projects))
-        if as_json:
-            _json_dump(_status_for_output(status))
-            return
-        _echo_status_lines(status)
+    store = TopicStateStore(resolve_state_path(resolved_config_path))
 
-    @topics_app.command(name="ensure")
-    def topics_ensure(
-        project: str = typer.Option(..., "--project", help="Project alias/id."),
-        branch: str | None = typer.Option(
-            None,
-            "--branch",
-            help="Optional branch name for the topic binding.",
-        ),
-        chat_id: int | None = typer.Option(
-            None,
-            "--chat-id",
-            help="Target chat id (defaults to project chat_id or main chat).",
-        ),
-        bind_state: bool = typer.Option(
-            True,
-            "--bind-state/--no-bind-state",
-            help="Persist topic->context binding in Takopi state.",
-        ),
-        as_json: bool = typer.Option(False, "--json", help="Output JSON."),
-        config_path: Path | None = _CONFIG_PATH_OPTION,
-    ) -> None:
-        """Ensure a project/branch topic exists in Telegram."""
-        settings, resolved_config_path = _load_settings_for_swarm(config_path)
-        try:
-            projects = _resolve_projects(settings, config_path=resolved_config_path)
-            project_key, project_alias = _resolve_project(project, projects)
-        except ConfigError as exc:
-            _exit_config_error(exc)
-
-        target_chat_id = _resolve_target_chat_id(
-            settings=settings,
-            projects=projects,
-            project_key=project_key,
+    async def _run() -> list[TopicStatus]:
+        return await list_topic_statuses(
+            store=store,
+            project_aliases=project_aliases,
             chat_id=chat_id,
         )
-        normalized_branch = normalize_branch(branch)
-        state_path = resolve_state_path(resolved_config_path)
-        token = settings.transports.telegram.bot_token
-
-        async def _run() -> tuple[TopicStatus, bool]:
-            bot = TelegramClient(token)
-            store = TopicStateStore(state_path)
-            try:
-                return await ensure_topic_thread(
-                    bot=bot,
-                    store=store,
-                    chat_id=target_chat_id,
-                    project_key=project_key,
-                    project_alias=project_alias,
-                    branch=normalized_branch,
-                    bind_state=bind_state,
-                )
-            finally:
-                await bot.close()
 
+    statuses = _run_blocking(_run)
+    if as_json:
+        _json_dump_array(_status_for_output(status) for status in statuses)
+        return
+    if not statuses:
+        typer.echo("no tracked topics")
+        return
+    for status in statuses:
+        _echo_status_lines(status)
+
+
+@topics_app.command(name="status")
+def topics_status(
+    chat_id: int = typer.Option(..., "--chat-id", help="Chat id."),
+    thread_id: int = typer.Option(..., "--thread-id", help="Thread id."),
+    as_json: bool = typer.Option(False, "--json", help="Output JSON."),
+    config_path: Path | None = _CONFIG_PATH_OPTION,
+) -> None:
+    """Show a single topic thread status."""
+    from ..telegram.topic_state import TopicStateStore, resolve_state_path
+
+    settings, resolved_config_path = _load_settings_for_swarm(config_path)
+    try:
+        project_aliases = _project_aliases(settings, config_path=resolved_config_path)
+    except ConfigError as exc:
+        _exit_config_error(exc)
+
+    store = TopicStateStore(resolve_state_path(resolved_config_path))
+    snapshot = _run_blocking(partial(store.get_thread, chat_id, thread_id))
+    if snapshot is None:
+        typer.echo("topic not found", err=True)
+        raise typer.Exit(code=1)
+    status = snapshot_to_status(snapshot, project_aliases=project_aliases)
+    if as_json:
+        _json_dump(_status_for_output(status))
+        return
+    _echo_status_lines(status)
+
+
+@topics_app.command(name="ensure")
+def topics_ensure(
+    project: str = typer.Option(..., "--project", help="Project alias/id."),
+    branch: str | None = typer.Option(
+        None,
+        "--branch",
+        help="Optional branch name for the topic binding.",
+    ),
+    chat_id: int | None = typer.Option(
+        None,
+        "--chat-id",
+        help="Target chat id (defaults to project chat_id or main chat).",
+    ),
+    bind_state: bool = typer.Option(
+        True,
+        "--bind-state/--no-bind-state",
+        help="Persist topic->context binding in Takopi state.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Output JSON."),
+    config_path: Path | None = _CONFIG_PATH_OPTION,
+) -> None:
+    """Ensure a project/branch topic exists in Telegram."""
+    from ..telegram.client import TelegramClient
+    from ..telegram.topic_state import TopicStateStore, resolve_state_path
+
+    settings, resolved_config_path = _load_settings_for_swarm(config_path)
+    try:
+        projects = _resolve_projects(settings, config_path=resolved_config_path)
+        project_key, project_alias = _resolve_project(project, projects)
+    except ConfigError as exc:
+        _exit_config_error(exc)
+
+    target_chat_id = _resolve_target_chat_id(
+        settings=settings,
+        projects=projects,
+        project_key=project_key,
+        chat_id=chat_id,
+    )
+    normalized_branch = normalize_branch(branch)
+    state_path = resolve_state_path(resolved_config_path)
+    token = settings.transports.telegram.bot_token
+
+    async def _run() -> tuple[TopicStatus, bool]:
+        bot = TelegramClient(token)
+        store = TopicStateStore(state_path)
         try:
-            status, created = anyio.run(_run)
-        except (ConfigError, RuntimeError) as exc:
-            _exit_config_error(ConfigError(str(exc)))
-
-        payload = {
-            "created": created,
-            "status": _status_for_output(status),
-            "state_path": str(state_path),
-        }
-        if as_json:
-            _json_dump(payload)
-            return
-        action = "created" if created else "reused"
-        typer.echo(
-            f"{action} topic {status.chat_id}:{status.thread_id} "
-            f"for {status.project or project_alias}"
-            + (f" @{status.branch}" if status.branch else "")
+            return await ensure_topic_thread(
+                bot=bot,
+                store=store,
+                chat_id=target_chat_id,
+                project_key=project_key,
+                project_alias=project_alias,
+                branch=normalized_branch,
+                bind_state=bind_state,
+            )
+        finally:
+            await bot.close()
+
+    try:
+        status, created = _run_blocking(_run)
+    except (ConfigError, RuntimeError) as exc:
+        _exit_config_error(ConfigError(str(exc)))
+
+    if as_json:
+        _json_dump(
+            EnsurePayload(
+                created=created,
+                state_path=str(state_path),
+                status=_status_for_output(status),
+            )
         )
+        return
+    action = "created" if created else "reused"
+    typer.echo(
+        f"{action} topic {status.chat_id}:{status.thread_id} "
+        f"for {status.project or project_alias}"
+        + (f" @{status.branch}" if status.branch else "")
+    )
 
-    @control_app.command(name="send")
-    def control_send(
-        text: str = typer.Argument(..., help="Message text."),
-        chat_id: int | None = typer.Option(
-            None,
-            "--chat-id",
-            help="Target chat id (defaults to main chat).",
-        ),
-        thread_id: int | None = typer.Option(
-            None,
-            "--thread-id",
-            help="Target thread id in forum chats.",
-        ),
-        notify: bool = typer.Option(
-            True,
-            "--notify/--silent",
-            help="Send with notification on/off.",
-        ),
-        as_json: bool = typer.Option(False, "--json", help="Output JSON."),
-        config_path: Path | None = _CONFIG_PATH_OPTION,
-    ) -> None:
-        """Send a control-plane Telegram message as the bot."""
-        settings, resolved_config_path = _load_settings_for_swarm(config_path)
+
+@control_app.command(name="send")
+def control_send(
+    text: str = typer.Argument(..., help="Message text."),
+    chat_id: int | None = typer.Option(
+        None,
+        "--chat-id",
+        help="Target chat id (defaults to main chat).",
+    ),
+    thread_id: int | None = typer.Option(
+        None,
+        "--thread-id",
+        help="Target thread id in forum chats.",
+    ),
+    notify: bool = typer.Option(
+        True,
+        "--notify/--silent",
+        help="Send with notification on/off.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Output JSON."),
+    config_path: Path | None = _CONFIG_PATH_OPTION,
+) -> None:
+    """Send a control-plane Telegram message as the bot."""
+    from ..telegram.client import TelegramClient
+
+    settings, resolved_config_path = _load_settings_for_swarm(config_path)
+    try:
+        projects = _resolve_projects(settings, config_path=resolved_config_path)
+    except ConfigError as exc:
+        _exit_config_error(exc)
+    target_chat_id = _resolve_target_chat_id(
+        settings=settings,
+        projects=projects,
+        project_key=None,
+        chat_id=chat_id,
+    )
+    token = settings.transports.telegram.bot_token
+
+    async def _run() -> int | None:
+        bot = TelegramClient(token)
         try:
-            projects = _resolve_projects(settings, config_path=resolved_config_path)
-        except ConfigError as exc:
-            _exit_config_error(exc)
-        target_chat_id = _resolve_target_chat_id(
-            settings=settings,
-            projects=projects,
-            project_key=None,
-            chat_id=chat_id,
-        )
-        token = settings.transports.telegram.bot_token
-
-        async def _run() -> int | None:
-            bot = TelegramClient(token)
-            try:
-                return await send_control_message(
-                    bot=bot,
-                    chat_id=target_chat_id,
-                    thread_id=thread_id,
-                    text=text,
-                    notify=notify,
-                )
-            finally:
-                await bot.close()
-
-        message_id = anyio.run(_run)
-        if as_json:
-            _json_dump(
-                {
-                    "chat_id": target_chat_id,
-                    "thread_id": thread_id,
-                    "message_id": message_id,
-                }
+            return await send_control_message(
+                bot=bot,
+                chat_id=target_chat_id,
+                thread_id=thread_id,
+                text=text,
+                notify=notify,
+            )
+        finally:
+            await bot.close()
+
+    message_id = _run_blocking(_run)
+    if as_json:
+        _json_dump(
+            ControlPayload(
+                chat_id=target_chat_id,
+                message_id=message_id,
+                thread_id=thread_id,
             )
-            return
-        if message_id is None:
-            typer.echo("control message failed", err=True)
-            raise typer.Exit(code=1)
-        typer.echo(
-            f"sent control message to chat {target_chat_id}"
-            + (f" thread {thread_id}" if thread_id is not None else "")
-            + f" (message_id={message_id})"
         )
+        return
+    if message_id is None:
+        typer.echo("control message failed", err=True)
+        raise typer.Exit(code=1)
+    typer.echo(
+        f"sent control message to chat {target_chat_id}"
+        + (f" thread {thread_id}" if thread_id is not None else "")
+        + f" (message_id={message_id})"
+    )
 
-    @trigger_app.command(name="send")
-    def trigger_send(
-        text: str = typer.Argument(..., help="Prompt text injected into Takopi loop."),
-        chat_id: int | None = typer.Option(
-            None,
-            "--chat-id",
-            help="Target chat id (defaults to main chat).",
-        ),
-        thread_id: int | None = typer.Option(
-            None,
-            "--thread-id",
-            help="Target thread id in forum chats.",
-        ),
-        origin_agent: str | None = typer.Option(
-            None,
-            "--origin-agent",
-            help="Optional source label written into ingress metadata.",
-        ),
-        as_json: bool = typer.Option(False, "--json", help="Output JSON."),
-        config_path: Path | None = _CONFIG_PATH_OPTION,
-    ) -> None:
-        """Queue a synthetic trigger message for Takopi's local swarm ingress."""
-        settings, resolved_config_path = _load_settings_for_swarm(config_path)
-        try:
-            projects = _resolve_projects(settings, config_path=resolved_config_path)
-        except ConfigError as exc:
-            _exit_config_error(exc)
 
-        ingress_cfg = _resolve_swarm_ingress_or_raise(
-            settings=settings,
-            config_path=resolved_config_path,
-        )
-        if ingress_cfg is None:
-            message = (
-                "swarm trigger ingress is disabled; set "
-                "`[plugins.swarm] enabled = true` in "
-                f"{_config_path_display(resolved_config_path)}"
-            )
-            typer.echo(f"error: {message}", err=True)
-            raise typer.Exit(code=2)
+@trigger_app.command(name="send")
+def trigger_send(
+    text: str = typer.Argument(..., help="Prompt text injected into Takopi loop."),
+    chat_id: int | None = typer.Option(
+        None,
+        "--chat-id",
+        help="Target chat id (defaults to main chat).",
+    ),
+    thread_id: int | None = typer.Option(
+        None,
+        "--thread-id",
+        help="Target thread id in forum chats.",
+    ),
+    origin_agent: str | None = typer.Option(
+        None,
+        "--origin-agent",
+        help="Optional source label written into ingress metadata.",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Output JSON."),
+    config_path: Path | None = _CONFIG_PATH_OPTION,
+) -> None:
+    """Queue a synthetic trigger message for Takopi's local swarm ingress."""
+    settings, resolved_config_path = _load_settings_for_swarm(config_path)
+    try:
+        projects = _resolve_projects(settings, config_path=resolved_config_path)
+    except ConfigError as exc:
+        _exit_config_error(exc)
 
-        target_chat_id = _resolve_target_chat_id(
-            settings=settings,
-            projects=projects,
-            project_key=None,
-            chat_id=chat_id,
-        )
-        envelope = new_swarm_envelope(
-            intent="trigger",
-            chat_id=target_chat_id,
-            thread_id=thread_id,
-            text=text,
-            origin_agent=origin_agent,
+    ingress_cfg = _resolve_swarm_ingress_or_raise(
+        settings=settings,
+        config_path=resolved_config_path,
+    )
+    if ingress_cfg is None:
+        message = (
+            "swarm trigger ingress is disabled; set "
+            "`[plugins.swarm] enabled = true` in "
+            f"{_config_path_display(resolved_config_path)}"
         )
-        append_swarm_envelope(ingress_cfg.inbox_path, envelope)
-
-        payload = {
-            "event_id": envelope.event_id,
-            "chat_id": target_chat_id,
-            "thread_id": thread_id,
-            "inbox_path": str(ingress_cfg.inbox_path),
-        }
-        if as_json:
-            _json_dump(payload)
-            return
-        typer.echo(
-            f"queued trigger {envelope.event_id} for chat {target_chat_id}"
-            + (f" thread {thread_id}" if thread_id is not None else "")
-            + f" via {ingress_cfg.inbox_path}"
+        typer.echo(f"error: {message}", err=True)
+        raise typer.Exit(code=2)
+
+    target_chat_id = _resolve_target_chat_id(
+        settings=settings,
+        projects=projects,
+        project_key=None,
+        chat_id=chat_id,
+    )
+    envelope = new_swarm_envelope(
+        intent="trigger",
+        chat_id=target_chat_id,
+        thread_id=thread_id,
+        text=text,
+        origin_agent=origin_agent,
+    )
+    append_swarm_envelope(ingress_cfg.inbox_path, envelope)
+
+    if as_json:
+        _json_dump(
+            TriggerPayload(
+                chat_id=target_chat_id,
+                event_id=envelope.event_id,
+                inbox_path=str(ingress_cfg.inbox_path),
+                thread_id=thread_id,
+            )
         )
+        return
+    typer.echo(
+        f"queued trigger {envelope.event_id} for chat {target_chat_id}"
+        + (f" thread {thread_id}" if thread_id is not None else "")
+        + f" via {ingress_cfg.inbox_path}"
+    )
+
 
-    app.add_typer(topics_app, name="topics")
-    app.add_typer(control_app, name="control")
-    app.add_typer(trigger_app, name="trigger")
+app.add_typer(topics_app, name="topics")
+app.add_typer(control_app, name="control")
+app.add_typer(trigger_app, name="trigger")
+
+
+def create_swarm_app() -> typer.Typer:
     return app
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import os
 import subprocess
 from collections.abc import Sequence
 from pathlib import Path
 
+# Skip optional index refreshes and never block on a credential prompt.
+_GIT_ENV = {"GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+
 
 def _run_git(
     args: Sequence[str], *, cwd: Path
@@ -12,6 +16,7 @@ def _run_git(
         return subprocess.run(
             ["git", *args],
             cwd=cwd,
+            env={**os.environ, **_GIT_ENV},
             check=False,
             text=True,
             capture_output=True,
@@ -1,18 +1,33 @@
 from __future__ import annotations
 
+import os
+import stat
+from functools import lru_cache
 from pathlib import Path
 
 from .config import ProjectConfig, ProjectsConfig
 from .context import RunContext
 from .utils.git import (
     git_is_worktree,
-    git_ok,
     git_run,
     git_stdout,
     resolve_default_base,
 )
 
 
+_SEP = os.sep
+# Project roots seen on disk; only the existing-worktree fast path trusts this.
+_KNOWN_ROOTS: set[Path] = set()
+# Verified worktree paths -> directory mtime at verification time.
+_KNOWN_WORKTREES: dict[str, int] = {}
+# Project root -> (HEAD stamp, current branch).
+_CURRENT_BRANCHES: dict[Path, tuple[tuple[int, int], str]] = {}
+# Project root -> ((HEAD stamp, origin/HEAD stamp), resolved default base).
+_DEFAULT_BASES: dict[
+    Path, tuple[tuple[tuple[int, int], tuple[int, int] | None], str]
+] = {}
+
+
 class WorktreeError(RuntimeError):
     pass
 
@@ -37,48 +52,54 @@ def resolve_run_cwd(
 
 def ensure_worktree(project: ProjectConfig, branch: str) -> Path:
     root = project.path
-    if not root.exists():
-        raise WorktreeError(f"project path not found: {root}")
+    root_checked = root not in _KNOWN_ROOTS
+    if root_checked:
+        _check_project_root(root)
 
     branch = _sanitize_branch(branch)
     worktrees_root = project.worktrees_root
-    worktree_path = worktrees_root / branch
-    _ensure_within_root(worktrees_root, worktree_path)
+    worktree_dir = os.path.join(worktrees_root, branch)
+    _ensure_within_root(worktrees_root, worktree_dir)
+    worktree_path = Path(worktree_dir)
 
-    if worktree_path.exists():
-        if not git_is_worktree(worktree_path):
-            raise WorktreeError(f"{worktree_path} exists but is not a git worktree")
+    try:
+        mtime_ns = os.stat(worktree_dir).st_mtime_ns
+    except OSError:
+        mtime_ns = None
+    if mtime_ns is not None:
+        if _KNOWN_WORKTREES.get(worktree_dir) != mtime_ns:
+            if not git_is_worktree(worktree_path):
+                raise WorktreeError(f"{worktree_path} exists but is not a git worktree")
+            _KNOWN_WORKTREES[worktree_dir] = mtime_ns
         return worktree_path
 
+    # Creating directories under a root that vanished would silently recreate it.
+    if not root_checked:
+        _check_project_root(root)
     worktrees_root.mkdir(parents=True, exist_ok=True)
 
-    if git_ok(
-        ["show-ref", "--verify", "--quiet", f"refs/heads/{branch}"],
-        cwd=root,
-    ):
-        _git_worktree_add(root, worktree_path, branch)
+    has_local, has_remote = _lookup_branch_refs(root, branch)
+    if has_local:
+        _git_worktree_add(root, worktree_dir, branch)
         return worktree_path
 
-    if git_ok(
-        ["show-ref", "--verify", "--quiet", f"refs/remotes/origin/{branch}"],
-        cwd=root,
-    ):
+    if has_remote:
         _git_worktree_add(
             root,
-            worktree_path,
+            worktree_dir,
             branch,
             base_ref=f"origin/{branch}",
             create_branch=True,
         )
         return worktree_path
 
-    base = project.worktree_base or resolve_default_base(root)
+    base = project.worktree_base or _default_base(root)
     if not base:
         raise WorktreeError("cannot determine base branch for new worktree")
 
     _git_worktree_add(
         root,
-        worktree_path,
+        worktree_dir,
         branch,
         base_ref=base,
         create_branch=True,
@@ -86,9 +107,30 @@ def ensure_worktree(project: ProjectConfig, branch: str) -> Path:
     return worktree_path
 
 
+def _check_project_root(root: Path) -> None:
+    if not root.exists():
+        _KNOWN_ROOTS.discard(root)
+        raise WorktreeError(f"project path not found: {root}")
+    _KNOWN_ROOTS.add(root)
+
+
+def _lookup_branch_refs(root: Path, branch: str) -> tuple[bool, bool]:
+    local_ref = f"refs/heads/{branch}"
+    remote_ref = f"refs/remotes/origin/{branch}"
+    output = git_stdout(
+        ["for-each-ref", "--format=%(refname)", local_ref, remote_ref],
+        cwd=root,
+    )
+    if not output:
+        return False, False
+    # for-each-ref patterns also match refs nested below them; require exact names.
+    refs = set(output.splitlines())
+    return local_ref in refs, remote_ref in refs
+
+
 def _git_worktree_add(
     root: Path,
-    worktree_path: Path,
+    worktree_path: str,
     branch: str,
     *,
     base_ref: str | None = None,
@@ -97,9 +139,9 @@ def _git_worktree_add(
     if create_branch:
         if not base_ref:
             raise WorktreeError("missing base ref for worktree creation")
-        args = ["worktree", "add", "-b", branch, str(worktree_path), base_ref]
+        args = ["worktree", "add", "-b", branch, worktree_path, base_ref]
     else:
-        args = ["worktree", "add", str(worktree_path), branch]
+        args = ["worktree", "add", worktree_path, branch]
 
     result = git_run(args, cwd=root)
     if result is None:
@@ -109,27 +151,109 @@ def _git_worktree_add(
         raise WorktreeError(message or "git worktree add failed")
 
 
+@lru_cache(maxsize=256)
 def _sanitize_branch(branch: str) -> str:
     cleaned = branch.strip()
     if not cleaned:
         raise WorktreeError("branch name cannot be empty")
     if cleaned.startswith("/"):
         raise WorktreeError("branch name cannot start with '/'")
-    for part in Path(cleaned).parts:
-        if part == "..":
-            raise WorktreeError("branch name cannot contain '..'")
+    path = cleaned.replace("\\", "/")
+    if path == ".." or path.startswith("../") or path.endswith("/..") or "/../" in path:
+        raise WorktreeError("branch name cannot contain '..'")
     return cleaned
 
 
 def _matches_project_branch(root: Path, branch: str) -> bool:
-    current = git_stdout(["branch", "--show-current"], cwd=root)
+    current = _current_branch(root)
     if not current:
         return False
     return current == branch
 
 
-def _ensure_within_root(root: Path, path: Path) -> None:
-    root_resolved = root.resolve(strict=False)
-    path_resolved = path.resolve(strict=False)
-    if not path_resolved.is_relative_to(root_resolved):
+def _file_stamp(path: str) -> tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_mtime_ns
+
+
+def _head_stamp(root: Path) -> tuple[int, int] | None:
+    # Checkouts rewrite HEAD via rename, so inode + mtime changes on every move.
+    return _file_stamp(os.path.join(root, ".git", "HEAD"))
+
+
+def _current_branch(root: Path) -> str | None:
+    stamp = _head_stamp(root)
+    if stamp is None:
+        return git_stdout(["branch", "--show-current"], cwd=root)
+    cached = _CURRENT_BRANCHES.get(root)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    current = git_stdout(["branch", "--show-current"], cwd=root)
+    if current is None:
+        # Not cached: git can fail (e.g. safe.directory) and recover without HEAD moving.
+        _CURRENT_BRANCHES.pop(root, None)
+    else:
+        _CURRENT_BRANCHES[root] = (stamp, current)
+    return current
+
+
+def _default_base(root: Path) -> str | None:
+    head = _head_stamp(root)
+    if head is None:
+        return resolve_default_base(root)
+    # resolve_default_base answers from origin/HEAD first, then from HEAD.
+    origin_head = _file_stamp(
+        os.path.join(root, ".git", "refs", "remotes", "origin", "HEAD")
+    )
+    stamp = (head, origin_head)
+    cached = _DEFAULT_BASES.get(root)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    base = resolve_default_base(root)
+    if base is None:
+        # Not cached: the repo may gain origin/HEAD or a branch without HEAD moving.
+        _DEFAULT_BASES.pop(root, None)
+    else:
+        _DEFAULT_BASES[root] = (stamp, base)
+    return base
+
+
+def _ensure_within_root(root: Path, path: str) -> None:
+    root_norm = os.path.normpath(root)
+    path_norm = os.path.normpath(path)
+    if not _is_within(root_norm, path_norm):
         raise WorktreeError("branch path escapes the worktrees directory")
+    # Only pay for realpath() when a symlink below root could redirect the path.
+    if not _has_symlink_below(root_norm, path_norm):
+        return
+    if not _is_within(os.path.realpath(root_norm), os.path.realpath(path_norm)):
+        raise WorktreeError("branch path escapes the worktrees directory")
+
+
+def _is_within(root: str, path: str) -> bool:
+    if path == root:
+        return True
+    if not path.startswith(root):
+        return False
+    return root.endswith(_SEP) or path[len(root)] == _SEP
+
+
+def _has_symlink_below(root: str, path: str) -> bool:
+    current = root
+    for part in path[len(root) :].split(_SEP):
+        if not part:
+            continue
+        current = os.path.join(current, part)
+        try:
+            mode = os.lstat(current).st_mode
+        except (FileNotFoundError, NotADirectoryError):
+            return False
+        except OSError:
+            # Can't inspect this component; let realpath() decide.
+            return True
+        if stat.S_ISLNK(mode):
+            return True
+    return False
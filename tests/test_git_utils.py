@@ -87,6 +87,23 @@ def test_git_run_handles_missing_git(monkeypatch) -> None:
     assert git_run(["status"], cwd=Path("/repo")) is None
 
 
+def test_git_run_disables_optional_locks_and_prompts(monkeypatch) -> None:
+    seen: dict[str, str] = {}
+
+    def _fake_run(*_args, env, **_kwargs):
+        seen.update(env)
+        return subprocess.CompletedProcess(
+            args=["git"], returncode=0, stdout="", stderr=""
+        )
+
+    monkeypatch.setenv("TAKOPI_TEST_ENV", "kept")
+    monkeypatch.setattr("takopi.utils.git.subprocess.run", _fake_run)
+    assert git_run(["status"], cwd=Path("/repo")) is not None
+    assert seen["GIT_OPTIONAL_LOCKS"] == "0"
+    assert seen["GIT_TERMINAL_PROMPT"] == "0"
+    assert seen["TAKOPI_TEST_ENV"] == "kept"
+
+
 def test_git_stdout_returns_none_on_error(monkeypatch) -> None:
     def _fake_run(*_args, **_kwargs):
         return subprocess.CompletedProcess(
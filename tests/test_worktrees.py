@@ -1,3 +1,5 @@
+import os
+import shutil
 from pathlib import Path
 from types import SimpleNamespace
 
@@ -5,7 +7,13 @@ import pytest
 
 from takopi.config import ProjectConfig, ProjectsConfig
 from takopi.context import RunContext
-from takopi.worktrees import WorktreeError, ensure_worktree, resolve_run_cwd
+from takopi.worktrees import (
+    WorktreeError,
+    _current_branch,
+    _default_base,
+    ensure_worktree,
+    resolve_run_cwd,
+)
 
 
 def _projects_config(path: Path) -> ProjectsConfig:
@@ -34,6 +42,14 @@ def test_resolve_run_cwd_rejects_invalid_branch(tmp_path: Path) -> None:
         resolve_run_cwd(ctx, projects=projects)
 
 
+@pytest.mark.parametrize("branch", ["feat/../../oops", "feat\\..\\oops", "  ", "/abs"])
+def test_resolve_run_cwd_rejects_unsafe_branches(tmp_path: Path, branch: str) -> None:
+    projects = _projects_config(tmp_path)
+    ctx = RunContext(project="z80", branch=branch)
+    with pytest.raises(WorktreeError, match="branch name"):
+        resolve_run_cwd(ctx, projects=projects)
+
+
 def test_resolve_run_cwd_uses_root_when_branch_matches(
     monkeypatch, tmp_path: Path
 ) -> None:
@@ -57,6 +73,79 @@ def test_resolve_run_cwd_uses_root_when_branch_matches(
     assert resolve_run_cwd(ctx, projects=projects) == tmp_path
 
 
+def test_resolve_run_cwd_caches_current_branch_until_head_moves(
+    monkeypatch, tmp_path: Path
+) -> None:
+    projects = _projects_config(tmp_path)
+    head = tmp_path / ".git" / "HEAD"
+    head.parent.mkdir()
+    head.write_text("ref: refs/heads/main\n")
+    calls: list[list[str]] = []
+
+    def _fake_stdout(args, **_kwargs):
+        calls.append(list(args))
+        return "main"
+
+    monkeypatch.setattr("takopi.worktrees.git_stdout", _fake_stdout)
+
+    ctx = RunContext(project="z80", branch="main")
+    assert resolve_run_cwd(ctx, projects=projects) == tmp_path
+    assert resolve_run_cwd(ctx, projects=projects) == tmp_path
+    assert len(calls) == 1
+
+    moved = head.with_name("HEAD.lock")
+    moved.write_text("ref: refs/heads/main\n")
+    moved.replace(head)
+    assert resolve_run_cwd(ctx, projects=projects) == tmp_path
+    assert len(calls) == 2
+
+
+def test_default_base_tracks_origin_head_and_skips_caching_none(
+    monkeypatch, tmp_path: Path
+) -> None:
+    git_dir = tmp_path / ".git"
+    (git_dir / "refs" / "remotes" / "origin").mkdir(parents=True)
+    (git_dir / "HEAD").write_text("ref: refs/heads/feat\n")
+    answers = [None, "main", "develop"]
+    calls: list[Path] = []
+
+    def _fake_default_base(root: Path) -> str | None:
+        calls.append(root)
+        return answers[len(calls) - 1]
+
+    monkeypatch.setattr("takopi.worktrees.resolve_default_base", _fake_default_base)
+
+    assert _default_base(tmp_path) is None
+    assert _default_base(tmp_path) == "main"
+    assert _default_base(tmp_path) == "main"
+    assert len(calls) == 2
+
+    (git_dir / "refs" / "remotes" / "origin" / "HEAD").write_text(
+        "ref: refs/remotes/origin/develop\n"
+    )
+    assert _default_base(tmp_path) == "develop"
+    assert len(calls) == 3
+
+
+def test_current_branch_skips_caching_none(monkeypatch, tmp_path: Path) -> None:
+    head = tmp_path / ".git" / "HEAD"
+    head.parent.mkdir()
+    head.write_text("ref: refs/heads/main\n")
+    answers = [None, "main"]
+    calls: list[list[str]] = []
+
+    def _fake_stdout(args: list[str], **kwargs) -> str | None:
+        calls.append(args)
+        return answers[len(calls) - 1]
+
+    monkeypatch.setattr("takopi.worktrees.git_stdout", _fake_stdout)
+
+    assert _current_branch(tmp_path) is None
+    assert _current_branch(tmp_path) == "main"
+    assert _current_branch(tmp_path) == "main"
+    assert len(calls) == 2
+
+
 def test_ensure_worktree_creates_from_base(monkeypatch, tmp_path: Path) -> None:
     project = ProjectConfig(
         alias="z80",
@@ -65,7 +154,7 @@ def test_ensure_worktree_creates_from_base(monkeypatch, tmp_path: Path) -> None:
     )
     calls: list[list[str]] = []
 
-    monkeypatch.setattr("takopi.worktrees.git_ok", lambda *args, **kwargs: False)
+    monkeypatch.setattr("takopi.worktrees.git_stdout", lambda *args, **kwargs: None)
     monkeypatch.setattr("takopi.worktrees.resolve_default_base", lambda *_: "main")
 
     def _fake_git_run(args, cwd):
@@ -79,6 +168,89 @@ def test_ensure_worktree_creates_from_base(monkeypatch, tmp_path: Path) -> None:
     assert calls == [["worktree", "add", "-b", "feat/name", str(worktree_path), "main"]]
 
 
+@pytest.mark.parametrize(
+    ("refs", "expected"),
+    [
+        ("refs/heads/feat", ["worktree", "add", "{path}", "feat"]),
+        (
+            "refs/remotes/origin/feat",
+            ["worktree", "add", "-b", "feat", "{path}", "origin/feat"],
+        ),
+        (
+            "refs/heads/feat/nested",
+            ["worktree", "add", "-b", "feat", "{path}", "main"],
+        ),
+    ],
+)
+def test_ensure_worktree_uses_existing_refs(
+    monkeypatch, tmp_path: Path, refs: str, expected: list[str]
+) -> None:
+    project = ProjectConfig(
+        alias="z80",
+        path=tmp_path,
+        worktrees_dir=Path(".worktrees"),
+    )
+    calls: list[list[str]] = []
+    stdout_calls: list[list[str]] = []
+
+    def _fake_stdout(args, **_kwargs):
+        stdout_calls.append(list(args))
+        return refs
+
+    def _fake_git_run(args, cwd):
+        calls.append(list(args))
+        return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr("takopi.worktrees.git_stdout", _fake_stdout)
+    monkeypatch.setattr("takopi.worktrees.resolve_default_base", lambda *_: "main")
+    monkeypatch.setattr("takopi.worktrees.git_run", _fake_git_run)
+
+    worktree_path = ensure_worktree(project, "feat")
+    assert stdout_calls == [
+        [
+            "for-each-ref",
+            "--format=%(refname)",
+            "refs/heads/feat",
+            "refs/remotes/origin/feat",
+        ]
+    ]
+    assert calls == [
+        [str(worktree_path) if arg == "{path}" else arg for arg in expected]
+    ]
+
+
+def test_ensure_worktree_rejects_missing_project_path(tmp_path: Path) -> None:
+    project = ProjectConfig(
+        alias="z80",
+        path=tmp_path / "missing",
+        worktrees_dir=Path(".worktrees"),
+    )
+
+    for _ in range(2):
+        with pytest.raises(WorktreeError, match="project path not found"):
+            ensure_worktree(project, "foo")
+
+
+def test_ensure_worktree_rechecks_root_before_creating(
+    monkeypatch, tmp_path: Path
+) -> None:
+    root = tmp_path / "repo"
+    (root / ".worktrees" / "foo").mkdir(parents=True)
+    project = ProjectConfig(
+        alias="z80",
+        path=root,
+        worktrees_dir=Path(".worktrees"),
+    )
+    monkeypatch.setattr("takopi.worktrees.git_is_worktree", lambda *_: True)
+
+    assert ensure_worktree(project, "foo") == root / ".worktrees" / "foo"
+    shutil.rmtree(root)
+
+    with pytest.raises(WorktreeError, match="project path not found"):
+        ensure_worktree(project, "bar")
+    assert not root.exists()
+
+
 def test_ensure_worktree_rejects_existing_non_worktree(
     monkeypatch, tmp_path: Path
 ) -> None:
@@ -101,3 +273,66 @@ def test_ensure_worktree_rejects_existing_non_worktree(
 
     with pytest.raises(WorktreeError, match="exists but is not a git worktree"):
         ensure_worktree(project, "foo")
+
+
+def test_ensure_worktree_rejects_symlink_escape(tmp_path: Path) -> None:
+    root = tmp_path / "repo"
+    outside = tmp_path / "outside"
+    (root / ".worktrees").mkdir(parents=True)
+    outside.mkdir()
+    (root / ".worktrees" / "evil").symlink_to(outside, target_is_directory=True)
+    project = ProjectConfig(
+        alias="z80",
+        path=root,
+        worktrees_dir=Path(".worktrees"),
+    )
+
+    with pytest.raises(WorktreeError, match="escapes the worktrees directory"):
+        ensure_worktree(project, "evil/name")
+
+
+def test_ensure_worktree_reports_file_in_the_way(monkeypatch, tmp_path: Path) -> None:
+    project = ProjectConfig(
+        alias="z80",
+        path=tmp_path,
+        worktrees_dir=Path(".worktrees"),
+    )
+    (tmp_path / ".worktrees").mkdir()
+    (tmp_path / ".worktrees" / "feat").write_text("not a directory")
+
+    def _fake_git_run(args, cwd):
+        return SimpleNamespace(returncode=128, stdout="", stderr="fatal: not a dir")
+
+    monkeypatch.setattr("takopi.worktrees.git_stdout", lambda *args, **kwargs: None)
+    monkeypatch.setattr("takopi.worktrees.resolve_default_base", lambda *_: "main")
+    monkeypatch.setattr("takopi.worktrees.git_run", _fake_git_run)
+
+    with pytest.raises(WorktreeError, match="not a dir"):
+        ensure_worktree(project, "feat/x")
+
+
+def test_ensure_worktree_skips_recheck_until_worktree_changes(
+    monkeypatch, tmp_path: Path
+) -> None:
+    project = ProjectConfig(
+        alias="z80",
+        path=tmp_path,
+        worktrees_dir=Path(".worktrees"),
+    )
+    worktree_path = tmp_path / ".worktrees" / "foo"
+    worktree_path.mkdir(parents=True)
+    checks: list[Path] = []
+
+    def _fake_is_worktree(path: Path) -> bool:
+        checks.append(path)
+        return True
+
+    monkeypatch.setattr("takopi.worktrees.git_is_worktree", _fake_is_worktree)
+
+    assert ensure_worktree(project, "foo") == worktree_path
+    assert ensure_worktree(project, "foo") == worktree_path
+    assert checks == [worktree_path]
+
+    os.utime(worktree_path, ns=(0, 1_000_000_000))
+    assert ensure_worktree(project, "foo") == worktree_path
+    assert checks == [worktree_path, worktree_path]